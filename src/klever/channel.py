@@ -28,14 +28,14 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from collections import deque
+from functools import lru_cache
 from types import TracebackType
-from typing import Any, Self, TypeVar, final
+from typing import TYPE_CHECKING, Any, Self, TypeVar, final
 
-from cocotb.queue import Queue
-from cocotb.task import Task, current_task
-from cocotb.triggers import Event, Lock
+from cocotb.triggers import Event
 
-from .types import SupportsCopy
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
 # Invariant generic type
 T = TypeVar("T")
@@ -54,16 +54,58 @@ class DisconnectedError(Exception):
 
 
 class ClosedError(Exception):
-    """Raised on attempt to operate with a closed endpoint."""
+    """Raised on attempt to operate with a closed endpoint.
+
+    Message is built lazily, because the error is often caught and handled without ever being printed.
+    """
+
+    def __init__(self, endpoint: _Endpoint[Any], action: str = "operate on") -> None:
+        """Initialize the error with the closed endpoint and the attempted action."""
+        super().__init__(endpoint, action)
+        self.endpoint = endpoint
+        self.action = action
+
+    def __str__(self) -> str:
+        """Return the error message."""
+        return f"Cannot {self.action} closed endpoint {self.endpoint!r}"
+
+
+@lru_cache(maxsize=256)
+def _resolve_copy(value_type: type) -> Callable[[Any], Any]:
+    """Resolve the `copy` method of the given value type.
+
+    The result is cached per type, so the lookup is done only once for every type of sent values.
+    A plain attribute probe is used instead of `issubclass` against the runtime-checkable `SupportsCopy` protocol,
+    which is a lot slower on a cache miss.
+    """
+    copy = getattr(value_type, "copy", None)
+    if not callable(copy):
+        raise TypeError("Sent value has to implement SupportsCopy protocol to satisfy copy_on_send setting")
+    return copy
 
 
 class _Channel[T](ABC):
     """Base class for channels.
 
-    Channel itself does not use a lock.
-    However, methods that may modify the state of the channel, should be called with the channel locked.
+    Channel does not use a lock.
+    Methods that modify the state of the channel (adding or removing endpoints) never await,
+    and cocotb schedules tasks cooperatively, so such a modification is never interleaved with another task.
     """
 
+    __slots__ = (
+        "_copy_on_send",
+        "_event_pool",
+        "_only_single_consumer",
+        "_only_single_producer",
+        "_open_receivers",
+        "_open_senders",
+        "receivers_available",
+        "senders_available",
+    )
+
+    # Maximum number of released events kept for reuse
+    _EVENT_POOL_SIZE = 64
+
     def __init__(
         self,
         copy_on_send: bool,
@@ -75,13 +117,15 @@ class _Channel[T](ABC):
         self._only_single_producer = only_single_producer
         self._only_single_consumer = only_single_consumer
 
+        # counters are checked on every operation, events are used only to wait for endpoints to appear
         self._open_senders = 0
         self._open_receivers = 0
 
-        self.lock = Lock()
         self.senders_available = Event()
         self.receivers_available = Event()
 
+        self._event_pool: deque[Event] = deque()
+
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} @{id(self):#x}>"
 
@@ -107,6 +151,44 @@ class _Channel[T](ABC):
         if self._open_receivers == 0:
             self.receivers_available.clear()
 
+    def _acquire_event(self) -> Event:
+        """Get a cleared event from the pool or create a new one."""
+        return self._event_pool.popleft() if self._event_pool else Event()
+
+    def _release_event(self, event: Event) -> None:
+        """Return an event to the pool, so it can be reused by the next operation."""
+        event.clear()
+        if len(self._event_pool) < self._EVENT_POOL_SIZE:
+            self._event_pool.append(event)
+
+    async def _wait_in_line(self, waiters: deque[Event]) -> None:
+        """Wait at the end of the line until woken up by `_wake_first` or `_wake_all`."""
+        event = self._acquire_event()
+        waiters.append(event)
+        try:
+            await event.wait()
+        except BaseException:
+            if event.is_set():
+                # waiter was cancelled after being woken up, so the wakeup is passed on to the next one
+                self._wake_first(waiters)
+            else:
+                waiters.remove(event)
+            raise
+        finally:
+            self._release_event(event)
+
+    @staticmethod
+    def _wake_first(waiters: deque[Event]) -> None:
+        """Wake up the first waiter in line, if any."""
+        if waiters:
+            waiters.popleft().set()
+
+    @staticmethod
+    def _wake_all(waiters: deque[Event]) -> None:
+        """Wake up all waiters in line."""
+        while waiters:
+            waiters.popleft().set()
+
     @property
     def copy_on_send(self) -> bool:
         """Copy on send setting."""
@@ -141,82 +223,188 @@ class _QueueChannel(_Channel[T]):
 
     When the channel is full, the sender will block until the channel is ready to receive more items.
     When the channel is empty, the receiver will block until the channel is ready to provide more items.
+
+    Queue is a plain deque, as cocotb runs all tasks in a single thread.
+    Blocked senders and receivers wait in FIFO lines, each on its own event.
+    Every operation wakes up only the first waiter of the opposite line, and a disconnection wakes up all of them.
+    Waiters re-check the buffer and the opposite endpoints after every wakeup,
+    so a blocked operation fails as soon as it gets disconnected.
+    Items that are already buffered are still delivered after the last sender is closed.
     """
 
+    __slots__ = ("_blocked_receivers", "_blocked_senders", "_buffer", "_capacity")
+
     def __init__(self, capacity: int, **kwargs: Any) -> None:
         super().__init__(**kwargs)
         self._capacity = capacity
         if capacity < 1:
             raise ValueError("Capacity must be a positive integer")
-        self._buffer = Queue[T](maxsize=capacity)
+        self._buffer: deque[T] = deque()
+        self._blocked_senders: deque[Event] = deque()
+        self._blocked_receivers: deque[Event] = deque()
 
     @property
     def capacity(self) -> int:
         """Capacity of the channel."""
         return self._capacity
 
+    def remove_sender(self, endpoint: _Endpoint[T]) -> None:
+        """Remove a sender from the channel."""
+        super().remove_sender(endpoint)
+        if not self._open_senders:
+            self._wake_all(self._blocked_receivers)  # so they observe the disconnection
+
+    def remove_receiver(self, endpoint: _Endpoint[T]) -> None:
+        """Remove a receiver from the channel."""
+        super().remove_receiver(endpoint)
+        if not self._open_receivers:
+            self._wake_all(self._blocked_senders)  # so they observe the disconnection
+
     async def send(self, _endpoint: _Endpoint[T], value: T) -> None:
         """Send a value to the channel, blocking if necessary."""
-        if self.copy_on_send:
-            if not isinstance(value, SupportsCopy):
-                raise TypeError("Sent value has to implement SupportsCopy protocol to satisfy copy_on_send setting")
-            value = value.copy()
-
-        if not self.receivers_available.is_set():
-            raise DisconnectedError("Cannot send when there are no open receivers")
+        while True:
+            if not self._open_receivers:
+                raise DisconnectedError("Cannot send when there are no open receivers")
+            if len(self._buffer) < self._capacity:
+                break
+            await self._wait_in_line(self._blocked_senders)
 
-        await self._buffer.put(value)
+        self._buffer.append(value)
+        self._wake_first(self._blocked_receivers)
 
     async def receive(self, _endpoint: _Endpoint[T]) -> T:
         """Receive a value from the channel."""
-        if not self.senders_available.is_set():
-            raise DisconnectedError("Cannot receive when there are no open senders")
+        while True:
+            if self._buffer:
+                break
+            if not self._open_senders:
+                raise DisconnectedError("Cannot receive when there are no open senders")
+            await self._wait_in_line(self._blocked_receivers)
+
+        value = self._buffer.popleft()
+        self._wake_first(self._blocked_senders)
+        return value
 
-        return await self._buffer.get()
+
+class _CopyOnSendQueueChannel(_QueueChannel[T]):
+    """Work queue channel that copies every sent value."""
+
+    __slots__ = ()
+
+    async def send(self, _endpoint: _Endpoint[T], value: T) -> None:
+        """Send a copy of the value to the channel, blocking if necessary."""
+        await super().send(_endpoint, _resolve_copy(type(value))(value))
 
 
 class _BroadcastChannel(_Channel[T]):
     """Channel that is used to communicate in a broadcast pattern.
 
-    There are separate queues for each receiver. And each receiver consumes from its own queue.
-    So, every receiver gets the same sent value (copy if needed) independently.
+    Every sent value is stored once in a buffer shared by all receivers, and each receiver reads it with its own cursor.
+    So, every receiver gets the same sent value independently.
+    A value is dropped from the buffer as soon as all receivers have consumed it.
+    Receivers that have consumed everything wait on a single shared event, which is set once per sent value
+    and whenever an endpoint is removed, so waiters observe the closing and the disconnection.
 
-    Capacity of queues is unlimited to avoid backpressure from receivers.
+    Capacity of the buffer is unlimited to avoid backpressure from receivers.
     """
 
+    __slots__ = ("_buffer", "_cursors", "_head_seq", "_new_data", "_pending", "_tail_seq")
+
     def __init__(self, **kwargs: Any) -> None:
         super().__init__(**kwargs)
-        self._queues: dict[_Endpoint[T], Queue[T]] = {}
+        self._buffer: deque[T] = deque()
+        self._pending: deque[int] = deque()  # number of receivers yet to consume each buffered value
+        self._tail_seq = 0  # sequence number of the oldest buffered value
+        self._head_seq = 0  # sequence number of the next sent value
+        self._cursors: dict[_Endpoint[T], int] = {}
+        self._new_data = Event()  # shared by all receivers waiting for the next value
 
     def add_receiver(self, endpoint: _Endpoint[T]) -> None:
         """Add a receiver to the channel."""
         super().add_receiver(endpoint)
-        self._queues[endpoint] = Queue[T](maxsize=0)
+        self._cursors[endpoint] = self._head_seq  # receiver gets only values sent after it is connected
+
+    def remove_sender(self, endpoint: _Endpoint[T]) -> None:
+        """Remove a sender from the channel."""
+        super().remove_sender(endpoint)
+        if not self._open_senders:
+            self._new_data.set()  # wake up waiting receivers, so they observe the disconnection
 
     def remove_receiver(self, endpoint: _Endpoint[T]) -> None:
         """Remove a receiver from the channel."""
         super().remove_receiver(endpoint)
-        self._queues.pop(endpoint)
+        cursor = self._cursors.pop(endpoint)
+        # values not consumed by the removed receiver should not wait for it anymore
+        for index in range(cursor - self._tail_seq, len(self._pending)):
+            self._pending[index] -= 1
+        self._trim()
+        self._new_data.set()  # wake up waiting receivers, so a receive on the removed one fails
+
+    def _trim(self) -> None:
+        """Drop values that are consumed by all receivers."""
+        while self._pending and self._pending[0] == 0:
+            self._buffer.popleft()
+            self._pending.popleft()
+            self._tail_seq += 1
+
+    def _consume(self, index: int) -> T:
+        """Consume the buffered value at the given index on behalf of a single receiver."""
+        self._pending[index] -= 1
+        return self._buffer[index]
 
     async def send(self, _endpoint: _Endpoint[T], value: T) -> None:
         """Send a value to the channel."""
-        if self._copy_on_send and not isinstance(value, SupportsCopy):
-            raise TypeError("Sent value has to implement SupportsCopy protocol to satisfy copy_on_send setting")
-
-        if not self.receivers_available.is_set():
+        if not self._open_receivers:
             raise DisconnectedError("Cannot send when there are no open receivers")
 
-        for queue in tuple(self._queues.values()):  # create a snapshot of the queues to avoid race
-            if self._copy_on_send:
-                value = value.copy()  # type: ignore[reportAssignmentType] # already guarded above
-            queue.put_nowait(value)
+        self._buffer.append(value)
+        self._pending.append(len(self._cursors))
+        self._head_seq += 1
+        self._new_data.set()
 
     async def receive(self, endpoint: _Endpoint[T]) -> T:
         """Receive a value from the channel."""
-        if not self.senders_available.is_set():
-            raise DisconnectedError("Cannot receive when there are no open senders")
+        # receivers that are behind consume buffered values without waiting,
+        # and the cursor is re-read after every wakeup, as several tasks may receive on the same endpoint,
+        # and the endpoint may be closed meanwhile
+        while True:
+            cursor = self._cursors.get(endpoint)
+            if cursor is None:
+                raise ClosedError(endpoint, "receive on")
+            if cursor != self._head_seq:
+                break
+            if not self._open_senders:
+                raise DisconnectedError("Cannot receive when there are no open senders")
+            self._new_data.clear()
+            await self._new_data.wait()
+
+        self._cursors[endpoint] = cursor + 1
+        index = cursor - self._tail_seq
+        value = self._consume(index)
+        if index == 0:
+            self._trim()
+        return value
+
+
+class _CopyOnSendBroadcastChannel(_BroadcastChannel[T]):
+    """Broadcast channel that gives every receiver its own copy of the sent value.
+
+    A single copy is buffered on send, so later modifications of the sent value are not visible to receivers.
+    Every receiver gets its own copy of the buffered one, except the last one, which takes the buffered copy itself.
+    """
 
-        return await self._queues[endpoint].get()
+    __slots__ = ()
+
+    def _consume(self, index: int) -> T:
+        """Consume a copy of the buffered value at the given index on behalf of a single receiver."""
+        value = super()._consume(index)
+        if self._pending[index] == 0:
+            return value
+        return _resolve_copy(type(value))(value)
+
+    async def send(self, _endpoint: _Endpoint[T], value: T) -> None:
+        """Send a copy of the value to the channel."""
+        await super().send(_endpoint, _resolve_copy(type(value))(value))
 
 
 class _RendezvousChannel(_Channel[T]):
@@ -225,54 +413,71 @@ class _RendezvousChannel(_Channel[T]):
     There is no buffering. Sender blocks until receiver is ready to consume the value, and vice versa.
     """
 
+    __slots__ = (
+        "_receiver_events",
+        "_sender_events",
+        "_sender_values",
+    )
+
     def __init__(self, **kwargs: Any) -> None:
         super().__init__(**kwargs)
-        self._senders: deque[tuple[T, Event, Task]] = deque()
-        self._receivers: deque[tuple[Event, Task]] = deque()
+        # pending senders and receivers are stored as parallel queues to avoid allocating a tuple per operation
+        self._sender_values: deque[T] = deque()
+        self._sender_events: deque[Event] = deque()
+        self._receiver_events: deque[Event] = deque()
+
+    def _popleft_sender(self) -> tuple[T, Event]:
+        """Pop the first pending sender."""
+        return self._sender_values.popleft(), self._sender_events.popleft()
 
     async def send(self, _endpoint: _Endpoint[T], value: T) -> None:
         """Send a value to the channel."""
-        if self.copy_on_send:
-            if not isinstance(value, SupportsCopy):
-                raise TypeError("Sent value has to implement SupportsCopy protocol to satisfy copy_on_send setting")
-            value = value.copy()
-
-        if not self.receivers_available.is_set():
+        if not self._open_receivers:
             raise DisconnectedError("Cannot send when there are no open receivers")
 
         # get into the queue of senders
-        event = Event()
-        self._senders.append((value, Event(), current_task()))
+        ack_event = self._acquire_event()
+        self._sender_values.append(value)
+        self._sender_events.append(ack_event)
 
         # try to wakeup the first available receiver
-        while self._receivers:
-            wakeup_event, receiver_task = self._receivers.popleft()
-            if not receiver_task.done():
-                wakeup_event.set()
-                break
+        self._wake_first(self._receiver_events)
 
         # wait for the rendezvous
-        await event.wait()
+        try:
+            await ack_event.wait()
+        finally:
+            if not ack_event.is_set():
+                # sender was cancelled before the rendezvous, so its value is withdrawn
+                index = self._sender_events.index(ack_event)
+                del self._sender_values[index]
+                del self._sender_events[index]
+            self._release_event(ack_event)
 
     async def receive(self, _endpoint: _Endpoint[T]) -> T:
         """Receive a value from the channel."""
-        if not self.senders_available.is_set():
+        if not self._open_senders:
             raise DisconnectedError("Cannot receive when there are no open senders")
 
         while True:
             # try to get the value from the first available sender
-            while self._senders:
-                value, ack_event, sender_task = self._senders.popleft()
-                if not sender_task.done():
-                    ack_event.set()
-                    return value
+            if self._sender_values:
+                value, ack_event = self._popleft_sender()
+                ack_event.set()
+                return value
 
-            # no senders available, get into the queue of receivers
-            event = Event()
-            self._receivers.append((event, current_task()))
+            # no senders available, get into the queue of receivers and wait for the rendezvous
+            await self._wait_in_line(self._receiver_events)
 
-            # wait for the rendezvous
-            await event.wait()
+
+class _CopyOnSendRendezvousChannel(_RendezvousChannel[T]):
+    """Rendezvous channel that copies every sent value."""
+
+    __slots__ = ()
+
+    async def send(self, _endpoint: _Endpoint[T], value: T) -> None:
+        """Send a copy of the value to the channel."""
+        await super().send(_endpoint, _resolve_copy(type(value))(value))
 
 
 class _Endpoint[T](ABC):
@@ -281,6 +486,8 @@ class _Endpoint[T](ABC):
     Designed to be instantiated only by the global `create(...)` function.
     """
 
+    __slots__ = ("_channel",)
+
     def __new__(cls, *_args: Any, **_kwargs: Any) -> Self:
         raise TypeError(f"Cannot instantiate {cls.__name__} directly, use klever.channel.create(...) function instead.")
 
@@ -306,9 +513,7 @@ class _Endpoint[T](ABC):
         """Clone the endpoint to create another endpoint bound to the same channel."""
         if self._channel is None:
             raise ValueError("Cannot clone a closed endpoint")
-        async with self._channel.lock:
-            # lock is required because channel state is modified
-            return self.__class__._create(self._channel)  # noqa: SLF001 # call of private method is intentional
+        return self.__class__._create(self._channel)  # noqa: SLF001 # call of private method is intentional
 
     @property
     def is_closed(self) -> bool:
@@ -344,6 +549,8 @@ class _Endpoint[T](ABC):
 class Sender(_Endpoint[SenderType]):
     """Endpoint for producer that allows to send items to the channel."""
 
+    __slots__ = ()
+
     def _init(self, channel: _Channel[SenderType]) -> None:
         super()._init(channel)
         if channel.only_single_producer and channel.senders_available.is_set():
@@ -356,7 +563,7 @@ class Sender(_Endpoint[SenderType]):
     async def send(self, value: SenderType) -> None:
         """Send a value to the channel."""
         if self._channel is None:
-            raise ClosedError(f"Cannot send on closed endpoint {self!r}")
+            raise ClosedError(self, "send on")
 
         await self._channel.send(self, value)
 
@@ -371,10 +578,13 @@ class Sender(_Endpoint[SenderType]):
 
         """
         while True:
+            channel = self._channel
+            if channel is None:
+                raise ClosedError(self, "send on")
             try:
-                await self.send(value)
+                return await channel.send(self, value)
             except DisconnectedError:
-                await self.wait_for_receivers()
+                await channel.receivers_available.wait()
 
     async def wait_for_receivers(self) -> None:
         """Wait until at least one receiver is connected to the channel.
@@ -387,7 +597,7 @@ class Sender(_Endpoint[SenderType]):
 
         """
         if self._channel is None:
-            raise ClosedError(f"Cannot wait on closed endpoint {self!r}")
+            raise ClosedError(self, "wait on")
         await self._channel.receivers_available.wait()
 
     async def close(self) -> None:
@@ -398,23 +608,23 @@ class Sender(_Endpoint[SenderType]):
         if self._channel is None:
             return
 
-        async with self._channel.lock:  # below modifies channel state
-            self._channel.remove_sender(self)
+        self._channel.remove_sender(self)
         self._channel = None
 
     async def derive_receiver(self) -> Receiver[SenderType]:
         """Derive a new receiver endpoint bound to the same channel as this sender."""
         if self._channel is None:
-            raise ClosedError(f"Cannot derive from closed endpoint {self!r}")
+            raise ClosedError(self, "derive from")
 
-        async with self._channel.lock:  # below modifies channel state
-            return Receiver._create(self._channel)  # noqa: SLF001 # call of private method is intentional
+        return Receiver._create(self._channel)  # noqa: SLF001 # call of private method is intentional
 
 
 @final
 class Receiver(_Endpoint[ReceiverType]):
     """Endpoint for receiver that allows to receive items from the channel."""
 
+    __slots__ = ()
+
     def _init(self, channel: _Channel[ReceiverType]) -> None:
         super()._init(channel)
         if channel.only_single_consumer and channel.receivers_available.is_set():
@@ -437,7 +647,7 @@ class Receiver(_Endpoint[ReceiverType]):
     async def receive(self) -> ReceiverType:
         """Receive a value from the channel, blocking if necessary."""
         if self._channel is None:
-            raise ClosedError(f"Cannot receive on closed endpoint {self!r}")
+            raise ClosedError(self, "receive on")
 
         return await self._channel.receive(self)
 
@@ -452,10 +662,13 @@ class Receiver(_Endpoint[ReceiverType]):
 
         """
         while True:
+            channel = self._channel
+            if channel is None:
+                raise ClosedError(self, "receive on")
             try:
-                return await self.receive()
+                return await channel.receive(self)
             except DisconnectedError:
-                await self.wait_for_senders()
+                await channel.senders_available.wait()
 
     async def wait_for_senders(self) -> None:
         """Wait until at least one sender is connected to the channel.
@@ -468,7 +681,7 @@ class Receiver(_Endpoint[ReceiverType]):
 
         """
         if self._channel is None:
-            raise ClosedError(f"Cannot wait on closed endpoint {self!r}")
+            raise ClosedError(self, "wait on")
         await self._channel.senders_available.wait()
 
     async def close(self) -> None:
@@ -476,17 +689,15 @@ class Receiver(_Endpoint[ReceiverType]):
         if self._channel is None:
             return
 
-        async with self._channel.lock:  # below modifies channel state
-            self._channel.remove_receiver(self)
+        self._channel.remove_receiver(self)
         self._channel = None
 
     async def derive_sender(self) -> Sender[ReceiverType]:
         """Derive a new sender endpoint bound to the same channel as this receiver."""
         if self._channel is None:
-            raise ClosedError(f"Cannot derive from closed endpoint {self!r}")
+            raise ClosedError(self, "derive from")
 
-        async with self._channel.lock:  # below modifies channel state
-            return Sender._create(self._channel)  # noqa: SLF001 # call of private method is intentional
+        return Sender._create(self._channel)  # noqa: SLF001 # call of private method is intentional
 
 
 def create[T](
@@ -520,11 +731,18 @@ def create[T](
         "only_single_consumer": only_single_consumer,
     }
 
+    # copy_on_send is resolved here once, so channels do not check it on every send
+    channel: _Channel[T]
     if broadcast:
-        channel = _BroadcastChannel[T](**common_kwargs)
+        broadcast_cls: type[_BroadcastChannel[T]] = _CopyOnSendBroadcastChannel if copy_on_send else _BroadcastChannel
+        channel = broadcast_cls(**common_kwargs)
     elif capacity == 0:
-        channel = _RendezvousChannel[T](**common_kwargs)
+        rendezvous_cls: type[_RendezvousChannel[T]] = (
+            _CopyOnSendRendezvousChannel if copy_on_send else _RendezvousChannel
+        )
+        channel = rendezvous_cls(**common_kwargs)
     else:
-        channel = _QueueChannel[T](**common_kwargs, capacity=capacity)
+        queue_cls: type[_QueueChannel[T]] = _CopyOnSendQueueChannel if copy_on_send else _QueueChannel
+        channel = queue_cls(**common_kwargs, capacity=capacity)
 
     return (Sender[T]._create(channel), Receiver[T]._create(channel))  # noqa: SLF001
@@ -0,0 +1,211 @@
+"""Cocotb tests of `klever.channel`, run in a simulator by `test_channel.py`."""
+
+from __future__ import annotations
+
+import cocotb
+import pytest
+from cocotb.triggers import Timer, with_timeout
+
+from klever import channel
+
+# Any blocked operation that is expected to complete must do so within this time
+TIMEOUT_NS = 100
+
+
+class Box:
+    """Mutable value that supports copying."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: int) -> None:
+        """Initialize the box with a value."""
+        self.value = value
+
+    def copy(self) -> Box:
+        """Return a copy of the box."""
+        return Box(self.value)
+
+
+async def settle() -> None:
+    """Let all other scheduled tasks run."""
+    await Timer(1, "ns")
+
+
+@cocotb.test()
+async def test_rendezvous_send_completes(_dut: object) -> None:
+    """Rendezvous send returns once a receiver takes the value, whichever side comes first."""
+    tx, rx = channel.create()
+
+    send_task = cocotb.start_soon(tx.send(1))
+    await settle()
+    assert not send_task.done()
+    assert await with_timeout(rx.receive(), TIMEOUT_NS, "ns") == 1
+    await with_timeout(send_task, TIMEOUT_NS, "ns")
+
+    receive_task = cocotb.start_soon(rx.receive())
+    await settle()
+    await with_timeout(tx.send(2), TIMEOUT_NS, "ns")
+    assert await with_timeout(receive_task, TIMEOUT_NS, "ns") == 2
+
+
+@cocotb.test()
+async def test_send_eventually_returns(_dut: object) -> None:
+    """send_eventually waits for a receiver, delivers the value once and returns."""
+    tx, rx = channel.create(capacity=2)
+    await rx.close()
+
+    send_task = cocotb.start_soon(tx.send_eventually(1))
+    await settle()
+    assert not send_task.done()
+
+    rx = await tx.derive_receiver()
+    await with_timeout(send_task, TIMEOUT_NS, "ns")
+    assert await rx.receive() == 1
+
+    receive_task = cocotb.start_soon(rx.receive())
+    await settle()
+    assert not receive_task.done()
+    receive_task.cancel()
+
+
+@cocotb.test()
+async def test_queue_delivers_buffered_after_senders_close(_dut: object) -> None:
+    """Items sent right before the last sender closes reach a blocked receiver."""
+    tx, rx = channel.create(capacity=2)
+
+    async def drain() -> list[int]:
+        return [value async for value in rx]
+
+    drain_task = cocotb.start_soon(drain())
+    await settle()
+    await tx.send(1)
+    await tx.close()
+    assert await with_timeout(drain_task, TIMEOUT_NS, "ns") == [1]
+
+
+@cocotb.test()
+async def test_queue_blocked_operations_fail_on_disconnect(_dut: object) -> None:
+    """Operations blocked on a full or empty queue fail once the opposite side is gone."""
+    tx, rx = channel.create(capacity=1)
+    await tx.send(1)
+    send_task = cocotb.start_soon(tx.send(2))
+    await settle()
+    assert not send_task.done()
+    await rx.close()
+    with pytest.raises(channel.DisconnectedError):
+        await with_timeout(send_task, TIMEOUT_NS, "ns")
+
+    tx, rx = channel.create(capacity=1)
+    receive_task = cocotb.start_soon(rx.receive())
+    await settle()
+    assert not receive_task.done()
+    await tx.close()
+    with pytest.raises(channel.DisconnectedError):
+        await with_timeout(receive_task, TIMEOUT_NS, "ns")
+
+
+@cocotb.test()
+async def test_queue_wakes_blocked_operations_in_order(_dut: object) -> None:
+    """Blocked senders are served in FIFO order, and a cancelled one does not hold up the others."""
+    tx, rx = channel.create(capacity=1)
+    await tx.send(0)
+    send_tasks = [cocotb.start_soon(tx.send(value)) for value in range(1, 51)]
+    await settle()
+    assert [await with_timeout(rx.receive(), TIMEOUT_NS, "ns") for _ in range(51)] == list(range(51))
+    for send_task in send_tasks:
+        assert send_task.done()
+
+    await tx.send(0)
+    cancelled_task = cocotb.start_soon(tx.send(1))
+    woken_task = cocotb.start_soon(tx.send(2))
+    await settle()
+    cancelled_task.cancel()
+    assert await rx.receive() == 0
+    await with_timeout(woken_task, TIMEOUT_NS, "ns")
+
+    send_tasks = [cocotb.start_soon(tx.send(value)) for value in (3, 4)]
+    await settle()
+    assert await rx.receive() == 2
+    send_tasks[0].cancel()  # cancelled right after being woken up, so the next sender takes its place
+    await settle()
+    assert send_tasks[1].done()
+    assert await rx.receive() == 4
+
+
+@cocotb.test()
+async def test_broadcast_blocked_receive_fails_on_close(_dut: object) -> None:
+    """Broadcast receive blocked on a receiver fails once it is closed or the last sender is gone."""
+    tx, rx = channel.create(broadcast=True)
+    rx2 = await rx.clone()
+    receive_task = cocotb.start_soon(rx2.receive())
+    await settle()
+    await rx2.close()
+    with pytest.raises(channel.ClosedError):
+        await with_timeout(receive_task, TIMEOUT_NS, "ns")
+
+    await tx.send(1)
+    receive_task = cocotb.start_soon(rx.receive())
+    await settle()
+    assert await with_timeout(receive_task, TIMEOUT_NS, "ns") == 1
+
+    receive_task = cocotb.start_soon(rx.receive())
+    await settle()
+    await tx.close()
+    with pytest.raises(channel.DisconnectedError):
+        await with_timeout(receive_task, TIMEOUT_NS, "ns")
+
+
+@cocotb.test()
+async def test_broadcast_late_receiver(_dut: object) -> None:
+    """Receiver connected after a send gets only values sent after it."""
+    tx, rx = channel.create(broadcast=True)
+    await tx.send(1)
+    late_rx = await rx.clone()
+    await tx.send(2)
+
+    assert [await rx.receive(), await rx.receive()] == [1, 2]
+    assert await late_rx.receive() == 2
+    receive_task = cocotb.start_soon(late_rx.receive())
+    await settle()
+    assert not receive_task.done()
+    receive_task.cancel()
+
+
+@cocotb.test()
+async def test_broadcast_remove_receiver_with_unread_values(_dut: object) -> None:
+    """Closing a receiver that is behind drops values consumed by all other receivers."""
+    tx, rx = channel.create(broadcast=True)
+    broadcast_channel = tx._channel
+    assert isinstance(broadcast_channel, channel._BroadcastChannel)
+    slow_rx = await rx.clone()
+    other_rx = await rx.clone()
+    for value in (1, 2, 3):
+        await tx.send(value)
+
+    assert [await rx.receive() for _ in range(3)] == [1, 2, 3]
+    assert await other_rx.receive() == 1
+    assert len(broadcast_channel._buffer) == 3
+
+    await slow_rx.close()
+    assert len(broadcast_channel._buffer) == 2
+    assert [await other_rx.receive() for _ in range(2)] == [2, 3]
+    assert len(broadcast_channel._buffer) == 0
+
+    await tx.send(4)
+    assert await rx.receive() == 4
+    assert await other_rx.receive() == 4
+    assert len(broadcast_channel._buffer) == 0
+
+
+@cocotb.test()
+async def test_broadcast_copy_on_send(_dut: object) -> None:
+    """Every receiver gets its own copy of the sent value under copy_on_send."""
+    tx, rx = channel.create(broadcast=True, copy_on_send=True)
+    receivers = [rx, await rx.clone(), await rx.clone()]
+    box = Box(1)
+    await tx.send(box)
+    box.value = 2
+
+    received = [await receiver.receive() for receiver in receivers]
+    assert [value.value for value in received] == [1, 1, 1]
+    assert len({id(value) for value in [box, *received]}) == 4
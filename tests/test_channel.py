@@ -0,0 +1,27 @@
+"""Run cocotb tests of `klever.channel` in a simulator."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from cocotb_tools.runner import get_runner
+
+TESTS_DIR = Path(__file__).parent
+
+
+def test_channel(tmp_path: Path) -> None:
+    """Build an empty toplevel and run `tests.channel_tests` against it."""
+    runner = get_runner(os.getenv("SIM", "verilator"))
+    runner.build(
+        sources=[TESTS_DIR / "top.sv"],
+        hdl_toplevel="top",
+        build_dir=tmp_path / "sim_build",
+        timescale=("1ns", "1ps"),
+    )
+    runner.test(
+        test_module="tests.channel_tests",
+        hdl_toplevel="top",
+        test_dir=tmp_path,
+        timescale=("1ns", "1ps"),
+    )